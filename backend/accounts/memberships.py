@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+
+from accounts.models import ServiceMembership
+
+
+def _cache_key(user_id: int) -> str:
+    return f"memberships:user:{user_id}"
+
+
+def get_active_memberships(user_id: int) -> list[tuple[int, str]]:
+    """
+    Return the user's active (guide_service_id, role) pairs.
+
+    Results are kept in the default cache for MEMBERSHIP_CACHE_TIMEOUT seconds and dropped
+    whenever one of the user's memberships is saved or deleted.
+    """
+
+    key = _cache_key(user_id)
+    memberships = cache.get(key)
+    if memberships is None:
+        memberships = list(
+            ServiceMembership.objects.filter(user_id=user_id, is_active=True).values_list(
+                "guide_service_id", "role"
+            )
+        )
+        cache.set(key, memberships, settings.MEMBERSHIP_CACHE_TIMEOUT)
+    return memberships
+
+
+def invalidate_memberships(user_id: int) -> None:
+    cache.delete(_cache_key(user_id))
+
+
+def get_active_guide_ids(service_id: int, guide_ids, *, request=None) -> set[int]:
+    """
+    Return which of guide_ids are active guides of the service.
+
+    When a request is given the answer is kept on it, so repeated validations of the same
+    guides within one request share a single query.
+    """
+
+    key = (service_id, frozenset(guide_ids))
+    results = getattr(request, "_ap_active_guides", None) if request is not None else None
+    if results is not None and key in results:
+        return results[key]
+
+    active_ids = set(
+        ServiceMembership.objects.filter(
+            user_id__in=key[1],
+            guide_service_id=service_id,
+            role=ServiceMembership.GUIDE,
+            is_active=True,
+        ).values_list("user_id", flat=True)
+    )
+    if request is not None:
+        if results is None:
+            results = request._ap_active_guides = {}
+        results[key] = active_ids
+    return active_ids
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .memberships import invalidate_memberships
+from .models import ServiceMembership
+
+
+@receiver(post_save, sender=ServiceMembership)
+@receiver(post_delete, sender=ServiceMembership)
+def handle_membership_change(sender, instance: ServiceMembership, **kwargs):
+    # Dropping the entry before commit would let a concurrent request cache the old roles again.
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_memberships(user_id))
@@ -0,0 +1,62 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from accounts.memberships import get_active_guide_ids, get_active_memberships
+from accounts.models import ServiceMembership
+from orgs.models import GuideService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def cached_memberships(settings):
+    settings.MEMBERSHIP_CACHE_TIMEOUT = 300
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_membership_changes_invalidate_cached_roles(
+    cached_memberships, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    user = User.objects.create_user(username="owner@example.com", email="owner@example.com", password="pass")
+    service = GuideService.objects.create(name="Summit", slug="summit", contact_email="ops@summit.test")
+    membership = ServiceMembership.objects.create(
+        user=user,
+        guide_service=service,
+        role=ServiceMembership.OWNER,
+    )
+
+    assert get_active_memberships(user.id) == [(service.id, ServiceMembership.OWNER)]
+    with django_assert_num_queries(0):
+        assert get_active_memberships(user.id) == [(service.id, ServiceMembership.OWNER)]
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        membership.mark_inactive()
+    # The cached roles stay until the write commits, so no request can re-cache them mid-transaction.
+    assert get_active_memberships(user.id) == [(service.id, ServiceMembership.OWNER)]
+
+    for callback in callbacks:
+        callback()
+    assert get_active_memberships(user.id) == []
+
+
+@pytest.mark.django_db
+def test_active_guide_ids_are_reused_within_a_request(django_assert_num_queries):
+    service = GuideService.objects.create(name="Summit", slug="summit", contact_email="ops@summit.test")
+    active = User.objects.create_user(username="active@example.com", email="active@example.com", password="pass")
+    inactive = User.objects.create_user(username="inactive@example.com", email="inactive@example.com", password="pass")
+    ServiceMembership.objects.create(user=active, guide_service=service, role=ServiceMembership.GUIDE)
+    ServiceMembership.objects.create(
+        user=inactive, guide_service=service, role=ServiceMembership.GUIDE, is_active=False
+    )
+
+    class Request:
+        pass
+
+    request = Request()
+    with django_assert_num_queries(1):
+        assert get_active_guide_ids(service.id, [active.id, inactive.id], request=request) == {active.id}
+        assert get_active_guide_ids(service.id, [inactive.id, active.id], request=request) == {active.id}
@@ -16,17 +16,15 @@ from bookings.services.guest_tokens import issue_guest_access_token, validate_gu
 
 
 class IsServiceStaff(permissions.BasePermission):
+    allowed_roles = frozenset({ServiceMembership.OWNER, ServiceMembership.MANAGER, ServiceMembership.GUIDE})
+
     def has_permission(self, request, view):
         if request.user.is_superuser:
             return True
         return ServiceMembership.objects.filter(
             user=request.user,
             is_active=True,
-            role__in=[
-                ServiceMembership.OWNER,
-                ServiceMembership.MANAGER,
-                ServiceMembership.GUIDE,
-            ],
+            role__in=self.allowed_roles,
         ).exists()
 
 
@@ -1,11 +1,13 @@
 from datetime import timedelta
 
+from django.db.models import Prefetch
 from django.utils import timezone
 from rest_framework import serializers
 
 from bookings.models import TripParty, TripPartyGuest, GuestProfile
 from bookings.services.payments import get_latest_payment_preview_url
-from trips.pricing import select_price_per_guest_cents, snapshot_base_price_cents
+from payments.models import Payment
+from trips.pricing import lookup_price_per_guest_cents
 
 
 class TripPartySummarySerializer(serializers.ModelSerializer):
@@ -26,6 +28,7 @@ class TripPartySummarySerializer(serializers.ModelSerializer):
             "waiver_status",
             "last_guest_activity_at",
         ]
+        read_only_fields = fields
 
 
 class GuestProfileSerializer(serializers.ModelSerializer):
@@ -153,6 +156,7 @@ class TripPartyResponseSerializer(serializers.ModelSerializer):
             "payment_url",
             "guest_portal_url",
         ]
+        read_only_fields = fields
 
     def get_payment_url(self, obj: TripParty):
         return getattr(obj, "_payment_url", None)
@@ -192,11 +196,23 @@ class TripPartySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join and prefetch what this serializer reads; payments only need the preview-link columns."""
+        payments = Payment.objects.only("id", "party_id", "amount_cents", "stripe_checkout_session", "created_at")
+        return queryset.select_related("primary_guest").prefetch_related(
+            "party_guests__guest", Prefetch("payments", queryset=payments)
+        )
+
     def get_payment_preview_url(self, obj: TripParty):
         return get_latest_payment_preview_url(obj)
 
     def get_guests(self, obj: TripParty):
-        guests = obj.party_guests.select_related("guest")
+        # Prefer the viewsets' party_guests__guest prefetch; otherwise join the guests in one query.
+        if "party_guests" in getattr(obj, "_prefetched_objects_cache", {}):
+            guests = obj.party_guests.all()
+        else:
+            guests = obj.party_guests.select_related("guest")
         return [
             {
                 "id": guest.guest_id,
@@ -208,14 +224,14 @@ class TripPartySerializer(serializers.ModelSerializer):
         ]
 
     def get_price_per_guest_cents(self, obj: TripParty) -> int:
-        trip = obj.trip
-        party_size = obj.party_size or 1
-        cents = select_price_per_guest_cents(
-            trip.pricing_snapshot,
-            party_size,
-            default=snapshot_base_price_cents(trip.pricing_snapshot),
-        )
-        return cents or trip.price_cents
+        # The four price fields all resolve the same tier; parties of a trip share the cache.
+        key = (obj.trip_id, obj.party_size or 1)
+        cache = self.__dict__.setdefault("_price_per_guest_cache", {})
+        if key not in cache:
+            trip = obj.trip
+            cents = lookup_price_per_guest_cents(trip.pricing_lookup, key[1])
+            cache[key] = cents or trip.price_cents
+        return cache[key]
 
     def get_price_per_guest(self, obj: TripParty) -> str:
         cents = self.get_price_per_guest_cents(obj)
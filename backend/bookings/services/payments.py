@@ -118,7 +118,12 @@ def get_latest_payment_preview_url(party: TripParty) -> str | None:
     if not _should_use_stub():
         return None
 
-    payment: Payment | None = party.payments.order_by("-created_at").first()
+    payment: Payment | None
+    if "payments" in getattr(party, "_prefetched_objects_cache", {}):
+        # Reuse the prefetched payments instead of re-querying them.
+        payment = max(party.payments.all(), key=lambda p: p.created_at, default=None)
+    else:
+        payment = party.payments.order_by("-created_at").first()
     if not payment or not payment.stripe_checkout_session:
         return None
 
@@ -78,6 +78,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -99,8 +103,20 @@ MEDIA_ROOT = Path(env("MEDIA_ROOT", default=BASE_DIR.parent / 'media'))
 MEDIA_URL = env("MEDIA_URL", default="/media/")
 if not MEDIA_URL.endswith('/'):
     MEDIA_URL = f"{MEDIA_URL}/"
+# When enabled, local media is served by nginx from an internal location, e.g.
+# `location /internal-media/ { internal; alias /var/media/; }`.
+USE_SENDFILE = env.bool('USE_SENDFILE', default=False)
+SENDFILE_URL_PREFIX = env('SENDFILE_URL_PREFIX', default='/internal-media/')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+CACHES = {'default': env.cache('CACHE_URL', default='locmemcache://')}
+# Seconds to cache a user's service memberships. Membership changes only invalidate the
+# cache they run against, so leave this at 0 (disabled) unless CACHE_URL points at a
+# cache shared by every worker.
+MEMBERSHIP_CACHE_TIMEOUT = env.int('MEMBERSHIP_CACHE_TIMEOUT', default=0)
+# Seconds to cache each service's trip template list; same shared-cache caveat as above.
+TRIP_TEMPLATE_CACHE_TIMEOUT = env.int('TRIP_TEMPLATE_CACHE_TIMEOUT', default=0)
+
 STRIPE_SECRET_KEY = env("STRIPE_SECRET_KEY", default="")
 STRIPE_CONNECT_CLIENT_ID = env("STRIPE_CONNECT_CLIENT_ID", default="")
 STRIPE_WEBHOOK_SECRET = env("STRIPE_WEBHOOK_SECRET", default="")
@@ -0,0 +1,15 @@
+import orjson
+from django.db import models
+
+
+class ORJSONField(models.JSONField):
+    """JSONField that decodes stored documents with orjson."""
+
+    def from_db_value(self, value, expression, connection):
+        if self.decoder is None and isinstance(value, (str, bytes)):
+            try:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
+                # Leave anything orjson rejects (NaN, oversized ints, bare strings) to the stock decoder.
+                pass
+        return super().from_db_value(value, expression, connection)
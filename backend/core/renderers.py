@@ -0,0 +1,48 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+
+def _default(obj):
+    """Encode the types DRF's JSON encoder knows about but orjson does not."""
+    if isinstance(obj, (Decimal, Promise)):
+        return str(obj)
+    if isinstance(obj, timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, (QuerySet, set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, "tolist"):
+        # numpy arrays and scalars
+        return obj.tolist()
+    if hasattr(obj, "__iter__"):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+
+    orjson encodes datetimes, UUIDs and dataclasses natively, so payloads such as the
+    Stripe status dict can be handed over without pre-formatting.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+    # OPT_NON_STR_KEYS matches the stdlib encoder, which stringifies int and other scalar dict keys.
+    options = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        options = self.options
+        if (renderer_context or {}).get("indent"):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=options)
@@ -0,0 +1,18 @@
+import math
+
+from core.fields import ORJSONField
+
+
+def test_decodes_stored_json_with_orjson():
+    field = ORJSONField()
+
+    assert field.from_db_value('{"tiers": [{"min_guests": 1, "max_guests": null}]}', None, None) == {
+        "tiers": [{"min_guests": 1, "max_guests": None}]
+    }
+    assert field.from_db_value(None, None, None) is None
+
+
+def test_falls_back_to_stock_decoder_for_values_orjson_rejects():
+    field = ORJSONField()
+
+    assert math.isnan(field.from_db_value("NaN", None, None))
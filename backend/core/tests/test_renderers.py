@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import orjson
+
+from core.renderers import ORJSONRenderer
+
+
+def test_renders_datetimes_and_decimals():
+    renderer = ORJSONRenderer()
+    payload = {
+        "connected": True,
+        "onboarding_expires_at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "deposit_percent": Decimal("25.00"),
+    }
+
+    rendered = orjson.loads(renderer.render(payload))
+
+    assert rendered == {
+        "connected": True,
+        "onboarding_expires_at": "2025-01-02T03:04:05Z",
+        "deposit_percent": "25.00",
+    }
+
+
+def test_renders_none_as_empty_body():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_renders_non_string_keys_like_stdlib_json():
+    rendered = orjson.loads(ORJSONRenderer().render({1: "one", "two": 2}))
+
+    assert rendered == {"1": "one", "two": 2}
+
+
+def test_renders_sets_and_generators_as_lists():
+    rendered = orjson.loads(ORJSONRenderer().render({"roles": {"owner"}, "ids": (n for n in range(3))}))
+
+    assert rendered == {"roles": ["owner"], "ids": [0, 1, 2]}
+
+
+def test_renders_bytes_as_text():
+    assert orjson.loads(ORJSONRenderer().render({"token": b"abc"})) == {"token": "abc"}
@@ -6,6 +6,7 @@ from datetime import datetime, timezone, timedelta
 import stripe
 from django.conf import settings
 from django.db import transaction
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.parsers import FormParser, MultiPartParser
@@ -35,9 +36,12 @@ logger = logging.getLogger(__name__)
 
 
 def configure_stripe():
-    if not settings.STRIPE_SECRET_KEY:
+    """Point the stripe module at the configured key, skipping the write once it is set."""
+    api_key = settings.STRIPE_SECRET_KEY
+    if not api_key:
         raise RuntimeError("STRIPE_SECRET_KEY is not configured.")
-    stripe.api_key = settings.STRIPE_SECRET_KEY
+    if stripe.api_key != api_key:
+        stripe.api_key = api_key
 
 
 def sync_account_from_stripe(
@@ -574,12 +578,33 @@ class GuideServiceDetailView(GuideServiceBaseView):
 
 
 class GuideServiceLogoView(GuideServiceBaseView):
-    """Upload or delete a guide service logo."""
+    """Serve, upload, or delete a guide service logo."""
 
     parser_classes = [MultiPartParser, FormParser]
     MAX_FILE_BYTES = 2 * 1024 * 1024  # 2 MB
     ALLOWED_CONTENT_TYPES = {"image/png", "image/jpeg", "image/svg+xml"}
 
+    def get(self, request, service_id, *args, **kwargs):
+        """
+        Return the logo bytes without copying them through Python where possible.
+
+        S3-backed media is redirected to the storage URL, `USE_SENDFILE` hands the
+        file to nginx via `X-Accel-Redirect`, and local development streams it.
+        """
+        logo = self.guide_service.logo
+        if not logo:
+            return Response({"detail": "No logo uploaded."}, status=status.HTTP_404_NOT_FOUND)
+
+        if settings.USE_S3_MEDIA:
+            return HttpResponseRedirect(logo.url)
+
+        content_type = mimetypes.guess_type(logo.name)[0] or "application/octet-stream"
+        if settings.USE_SENDFILE:
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = f"{settings.SENDFILE_URL_PREFIX}{logo.name}"
+            return response
+        return FileResponse(logo.open("rb"), content_type=content_type)
+
     def post(self, request, service_id, *args, **kwargs):
         logo_file = request.FILES.get("logo")
         if logo_file is None:
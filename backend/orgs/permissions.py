@@ -9,7 +9,7 @@ class IsServiceOwnerOrManager(BasePermission):
     Superusers automatically pass.
     """
 
-    allowed_roles = {ServiceMembership.OWNER, ServiceMembership.MANAGER}
+    allowed_roles = frozenset({ServiceMembership.OWNER, ServiceMembership.MANAGER})
 
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
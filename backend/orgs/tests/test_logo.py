@@ -2,7 +2,7 @@ import io
 
 import pytest
 from django.core.files.base import ContentFile
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile
 from django.urls import reverse
 from PIL import Image
 from rest_framework.test import APIClient
@@ -11,12 +11,12 @@ from accounts.models import ServiceMembership, User
 from orgs.models import GuideService
 
 
-def _logo_file(name: str = "logo.png") -> SimpleUploadedFile:
+def _logo_file(name: str = "logo.png") -> InMemoryUploadedFile:
     buffer = io.BytesIO()
     image = Image.new("RGB", (32, 32), color="blue")
     image.save(buffer, format="PNG")
     buffer.seek(0)
-    return SimpleUploadedFile(name, buffer.read(), content_type="image/png")
+    return InMemoryUploadedFile(buffer, None, name, "image/png", buffer.getbuffer().nbytes, None)
 
 
 @pytest.fixture
@@ -143,3 +143,50 @@ def test_non_owner_cannot_update_logo(settings, tmp_path, owner, guide, guide_se
     )
 
     assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_owner_downloads_logo(settings, tmp_path, owner, guide_service):
+    settings.MEDIA_ROOT = tmp_path
+    settings.USE_SENDFILE = False
+    ServiceMembership.objects.create(
+        user=owner,
+        guide_service=guide_service,
+        role=ServiceMembership.OWNER,
+    )
+    guide_service.logo.save(
+        "existing.png",
+        ContentFile(_logo_file().read(), name="existing.png"),
+    )
+
+    client = APIClient()
+    client.force_authenticate(owner)
+
+    response = client.get(reverse("guide-service-logo", args=[guide_service.id]))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/png"
+    assert b"".join(response.streaming_content).startswith(b"\x89PNG")
+
+
+@pytest.mark.django_db
+def test_logo_download_uses_sendfile(settings, tmp_path, owner, guide_service):
+    settings.MEDIA_ROOT = tmp_path
+    settings.USE_SENDFILE = True
+    settings.SENDFILE_URL_PREFIX = "/internal-media/"
+    ServiceMembership.objects.create(
+        user=owner,
+        guide_service=guide_service,
+        role=ServiceMembership.OWNER,
+    )
+    guide_service.logo.save(
+        "existing.png",
+        ContentFile(_logo_file().read(), name="existing.png"),
+    )
+
+    client = APIClient()
+    client.force_authenticate(owner)
+
+    response = client.get(reverse("guide-service-logo", args=[guide_service.id]))
+    assert response.status_code == 200
+    assert response["X-Accel-Redirect"] == f"/internal-media/{guide_service.logo.name}"
+    assert response.content == b""
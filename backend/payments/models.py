@@ -9,3 +9,9 @@ class Payment(models.Model):
     stripe_checkout_session = models.CharField(max_length=255, blank=True)
     status = models.CharField(max_length=30)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['stripe_payment_intent'], name='payment_pi_idx'),
+            models.Index(fields=['party', 'status'], name='payment_party_status_idx'),
+        ]
@@ -1,4 +1,14 @@
 from django.contrib import admin
 from .models import Trip, Assignment, TripTemplate
 
-admin.site.register((Trip, Assignment, TripTemplate))
+
+class WithRelatedAdmin(admin.ModelAdmin):
+    """Join the foreign keys each model's __str__ reads so changelists avoid per-row lookups."""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related()
+
+
+admin.site.register(Trip)
+# Assignment.__str__ reads trip and guide; TripTemplate.__str__ reads service.
+admin.site.register((Assignment, TripTemplate), WithRelatedAdmin)
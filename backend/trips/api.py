@@ -1,12 +1,16 @@
+from collections.abc import Sequence
 from datetime import timedelta
 
 from django.conf import settings
-from django.db.models import Sum
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Subquery, prefetch_related_objects
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
+from accounts.memberships import get_active_memberships
 from accounts.models import ServiceMembership, User
 from bookings.models import TripParty, TripPartyGuest
 from bookings.serializers import (
@@ -20,8 +24,9 @@ from bookings.services.guest_tokens import issue_guest_access_token
 from bookings.services.guests import upsert_guest_profile
 from bookings.services.payments import create_checkout_session
 from payments.models import Payment
+from .caching import template_list_cache_key
 from .models import Trip, Assignment, TripTemplate
-from .pricing import select_price_per_guest_cents
+from .pricing import lookup_price_per_guest_cents
 from .serializers import (
     TripSerializer,
     TripCreateSerializer,
@@ -30,9 +35,31 @@ from .serializers import (
     TripTemplateSerializer,
 )
 
+PRIVILEGED_ROLES = frozenset((ServiceMembership.OWNER, ServiceMembership.MANAGER))
+
+
+def _active_memberships(request) -> list[tuple[int, str]]:
+    """Return the user's active (guide_service_id, role) pairs, cached on the request."""
+    memberships = getattr(request, "_ap_memberships", None)
+    if memberships is None:
+        memberships = get_active_memberships(request.user.pk)
+        request._ap_memberships = memberships
+    return memberships
+
+
+def _can_manage_service(request, service_id) -> bool:
+    if request.user.is_superuser:
+        return True
+    # URL kwargs arrive as strings; compare as text so malformed ids simply don't match.
+    service_id = str(service_id)
+    return any(
+        str(membership_service_id) == service_id and role in PRIVILEGED_ROLES
+        for membership_service_id, role in _active_memberships(request)
+    )
+
 
 def _price_per_guest_cents(trip: Trip, party_size: int) -> int:
-    cents = select_price_per_guest_cents(trip.pricing_snapshot, party_size, default=trip.price_cents)
+    cents = lookup_price_per_guest_cents(trip.pricing_lookup, party_size)
     return cents or trip.price_cents
 
 
@@ -48,41 +75,35 @@ class TripViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "location", "description"]
     ordering_fields = ["start", "end"]
 
+    def _trip_queryset(self):
+        """Trips with everything TripSerializer reads joined or prefetched."""
+        return TripSerializer.prefetch_queryset(Trip.objects.order_by("start"))
+
     def get_queryset(self):
         user = self.request.user
-        base_queryset = Trip.objects.all().order_by("start").prefetch_related(
-            "parties__primary_guest",
-            "parties__party_guests__guest",
-            "parties__payments",
-            "assignments__guide",
-        )
+        base_queryset = self._trip_queryset()
 
         if user.is_superuser:
             return base_queryset
 
-        memberships = ServiceMembership.objects.filter(user=user, is_active=True)
-        if not memberships.exists():
+        memberships = _active_memberships(self.request)
+        if not memberships:
             return base_queryset.none()
 
-        privileged_roles = {ServiceMembership.OWNER, ServiceMembership.MANAGER}
-        if memberships.filter(role__in=privileged_roles).exists():
-            service_ids = memberships.values_list("guide_service_id", flat=True)
+        roles = {role for _, role in memberships}
+        if roles & PRIVILEGED_ROLES:
+            service_ids = {service_id for service_id, _ in memberships}
             return base_queryset.filter(guide_service_id__in=service_ids)
 
-        if memberships.filter(role=ServiceMembership.GUIDE).exists():
-            return base_queryset.filter(assignments__guide=user).distinct()
+        if ServiceMembership.GUIDE in roles:
+            return base_queryset.filter(
+                Exists(Assignment.objects.filter(trip_id=OuterRef("pk"), guide=user))
+            )
 
         return base_queryset.none()
 
-    def _user_can_manage_trip(self, user, trip: Trip) -> bool:
-        if user.is_superuser:
-            return True
-        return ServiceMembership.objects.filter(
-            user=user,
-            guide_service=trip.guide_service,
-            role__in=[ServiceMembership.OWNER, ServiceMembership.MANAGER],
-            is_active=True,
-        ).exists()
+    def _user_can_manage_trip(self, trip: Trip) -> bool:
+        return _can_manage_service(self.request, trip.guide_service_id)
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -91,7 +112,8 @@ class TripViewSet(viewsets.ModelViewSet):
             return TripUpdateSerializer
         return super().get_serializer_class()
 
-    def _create_party_instance(self, *, trip: Trip, party_data: dict) -> TripParty:
+    def _create_party_records(self, *, trip: Trip, party_data: dict) -> TripParty:
+        """Write the party, its guests and the guest access token; run inside the caller's atomic block."""
         primary_guest = upsert_guest_profile(party_data["primary_guest"])
         additional_guests_data = party_data.get("additional_guests", [])
         additional_guests = [upsert_guest_profile(guest_data) for guest_data in additional_guests_data]
@@ -109,11 +131,31 @@ class TripViewSet(viewsets.ModelViewSet):
             waiver_status=TripParty.WAIVER_PENDING,
         )
 
-        TripPartyGuest.objects.create(party=party, guest=primary_guest, is_primary=True)
-        for guest in additional_guests:
-            TripPartyGuest.objects.get_or_create(party=party, guest=guest, defaults={"is_primary": False})
+        # The primary row goes first so a repeated guest keeps is_primary; (party, guest) is unique.
+        TripPartyGuest.objects.bulk_create(
+            [TripPartyGuest(party=party, guest=primary_guest, is_primary=True)]
+            + [TripPartyGuest(party=party, guest=guest, is_primary=False) for guest in additional_guests],
+            ignore_conflicts=True,
+        )
 
-        amount_cents = _calculate_amount_cents(trip, party_size)
+        expires_at = trip.end + timedelta(days=1)
+        _, raw_token = issue_guest_access_token(
+            guest=primary_guest,
+            party=party,
+            expires_at=expires_at,
+            single_use=False,
+        )
+        party._guest_portal_url = f"{settings.FRONTEND_URL}/guest?token={raw_token}"
+        party._confirmation_recipients = list(dict.fromkeys(guest.email for guest in guests if guest.email))
+        return party
+
+    def _start_party_checkout(self, party: TripParty):
+        """
+        Open the Stripe checkout session and record its payment once the party rows are committed,
+        so no transaction is held across the Stripe round-trip. The confirmation email follows
+        the commit of any enclosing transaction.
+        """
+        amount_cents = _calculate_amount_cents(party.trip, party.party_size)
         checkout_session = create_checkout_session(party=party, amount_cents=amount_cents)
 
         Payment.objects.create(
@@ -125,47 +167,34 @@ class TripViewSet(viewsets.ModelViewSet):
             status=checkout_session.payment_status,
         )
 
-        expires_at = trip.end + timedelta(days=1)
-        _, raw_token = issue_guest_access_token(
-            guest=primary_guest,
-            party=party,
-            expires_at=expires_at,
-            single_use=False,
-        )
-        guest_portal_url = f"{settings.FRONTEND_URL}/guest?token={raw_token}"
-        payment_url = getattr(checkout_session, "url", None)
+        party._payment_url = getattr(checkout_session, "url", None)
+        transaction.on_commit(lambda: self._send_party_confirmation(party))
 
-        recipient_emails = [guest.email for guest in guests if guest.email]
-        if recipient_emails:
+    @staticmethod
+    def _send_party_confirmation(party: TripParty):
+        if party._confirmation_recipients:
             send_booking_confirmation_email(
                 party=party,
-                payment_url=payment_url,
-                guest_portal_url=guest_portal_url,
-                recipients=recipient_emails,
+                payment_url=party._payment_url,
+                guest_portal_url=party._guest_portal_url,
+                recipients=party._confirmation_recipients,
             )
 
-        party._payment_url = payment_url
-        party._guest_portal_url = guest_portal_url
-        return party
-
     @action(detail=True, methods=["post", "get"], url_path="parties")
     def parties(self, request, pk=None):
         trip = self.get_object()
-        if not self._user_can_manage_trip(request.user, trip):
+        if not self._user_can_manage_trip(trip):
             return Response({"detail": "Not permitted."}, status=status.HTTP_403_FORBIDDEN)
 
         if request.method.lower() == "get":
-            parties = (
-                trip.parties.select_related("primary_guest")
-                .prefetch_related("party_guests__guest", "payments")
-                .order_by("created_at")
-            )
-            serializer = TripPartySerializer(parties, many=True)
+            serializer = TripPartySerializer(trip.parties.all(), many=True)
             return Response({"parties": serializer.data})
 
         serializer = TripPartyCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        party = self._create_party_instance(trip=trip, party_data=serializer.validated_data)
+        with transaction.atomic():
+            party = self._create_party_records(trip=trip, party_data=serializer.validated_data)
+        self._start_party_checkout(party)
 
         response_serializer = TripPartyResponseSerializer(party)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -173,11 +202,15 @@ class TripViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["patch"], url_path="parties/(?P<party_id>[^/.]+)")
     def update_party(self, request, pk=None, party_id=None):
         trip = self.get_object()
-        if not self._user_can_manage_trip(request.user, trip):
+        if not self._user_can_manage_trip(trip):
             return Response({"detail": "Not permitted."}, status=status.HTTP_403_FORBIDDEN)
 
         try:
-            party = trip.parties.select_related("trip").prefetch_related("party_guests__guest").get(id=party_id)
+            party = (
+                trip.parties.select_related("trip", "primary_guest")
+                .prefetch_related("party_guests__guest")
+                .get(id=party_id)
+            )
         except TripParty.DoesNotExist:
             return Response({"detail": "Party not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -197,12 +230,12 @@ class TripViewSet(viewsets.ModelViewSet):
 
             if party.payment_status == TripParty.PENDING:
                 amount_cents = _calculate_amount_cents(trip, party.party_size)
-                latest_payment = party.payments.order_by("-created_at").first()
-                if latest_payment:
-                    status_value = (latest_payment.status or "").lower()
-                    if status_value in {"unpaid", "open", "requires_payment_method", "pending"}:
-                        latest_payment.amount_cents = amount_cents
-                        latest_payment.save(update_fields=["amount_cents"])
+                # Reprice the latest payment in place, but only while it is still unpaid.
+                latest_payment_id = party.payments.order_by("-created_at").values("pk")[:1]
+                Payment.objects.filter(
+                    pk=Subquery(latest_payment_id),
+                    status__iregex=r"^(unpaid|open|requires_payment_method|pending)$",
+                ).update(amount_cents=amount_cents)
 
         response_serializer = TripPartySerializer(party)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -212,77 +245,76 @@ class TripViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({"detail": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        permitted = request.user.is_superuser or ServiceMembership.objects.filter(
-            user=request.user,
-            guide_service_id=service_id,
-            role__in=[ServiceMembership.OWNER, ServiceMembership.MANAGER],
-            is_active=True,
-        ).exists()
-
-        if not permitted:
+        if not _can_manage_service(request, service_id):
             return Response({"detail": "Not permitted."}, status=status.HTTP_403_FORBIDDEN)
 
         guides = User.objects.filter(
-            servicemembership__guide_service_id=service_id,
-            servicemembership__role=ServiceMembership.GUIDE,
-            servicemembership__is_active=True,
-        ).distinct()
+            Exists(
+                ServiceMembership.objects.filter(
+                    user_id=OuterRef("pk"),
+                    guide_service_id=service_id,
+                    role=ServiceMembership.GUIDE,
+                    is_active=True,
+                )
+            )
+        ).values(*GuideSummarySerializer.Meta.fields)
 
-        serializer = GuideSummarySerializer(guides, many=True)
-        return Response(serializer.data)
+        # Plain column values already match the summary shape; skip per-instance serialization.
+        return Response(list(guides))
 
     def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
+        context = self.get_serializer_context()
+        serializer = self.get_serializer(data=request.data, context=context)
         serializer.is_valid(raise_exception=True)
-        trip = serializer.save()
-        party_data = serializer.context.get("party_data")
+        with transaction.atomic():
+            trip = serializer.save()
+            party_data = serializer.context.get("party_data")
 
-        if party_data is None:
-            trip.delete()
-            return Response({"detail": "A party is required when creating a trip."}, status=status.HTTP_400_BAD_REQUEST)
+            if party_data is None:
+                trip.delete()
+                return Response({"detail": "A party is required when creating a trip."}, status=status.HTTP_400_BAD_REQUEST)
 
-        party_serializer = TripPartyCreateSerializer(data=party_data)
-        party_serializer.is_valid(raise_exception=True)
+            party_serializer = TripPartyCreateSerializer(data=party_data)
+            party_serializer.is_valid(raise_exception=True)
 
-        party = self._create_party_instance(trip=trip, party_data=party_serializer.validated_data)
+            party = self._create_party_records(trip=trip, party_data=party_serializer.validated_data)
 
-        guides = serializer.context.get("guides", [])
-        self._replace_assignments(trip, guides)
+            guides = serializer.context.get("guides", [])
+            self._replace_assignments_by_ids(trip, [guide.id for guide in guides])
 
-        if not trip.title.strip():
-            primary_guest = party.primary_guest
-            fallback_title = primary_guest.full_name or primary_guest.email or "Private Trip"
-            Trip.objects.filter(pk=trip.pk).update(title=fallback_title)
+            if not trip.title.strip():
+                primary_guest = party.primary_guest
+                fallback_title = primary_guest.full_name or primary_guest.email or "Private Trip"
+                Trip.objects.filter(pk=trip.pk).update(title=fallback_title)
+                trip.title = fallback_title
 
-        trip.refresh_from_db()
-        output = TripSerializer(trip, context=self.get_serializer_context())
-        headers = self.get_success_headers(output.data)
+        self._start_party_checkout(party)
+
+        # The saved instance already holds every column; only its relations need loading.
+        prefetch_related_objects([trip], *TripSerializer.prefetches())
+        output = TripSerializer(trip, context=context)
+        # TripSerializer exposes no url field, so the id is all the header lookup needs.
+        headers = self.get_success_headers({"id": trip.pk})
         return Response(output.data, status=status.HTTP_201_CREATED, headers=headers)
 
-    def _replace_assignments(self, trip: Trip, guides):
-        guide_ids = []
-        seen = set()
-        for guide in guides:
-            guide_id = guide.id if hasattr(guide, "id") else int(guide)
-            if guide_id not in seen:
-                seen.add(guide_id)
-                guide_ids.append(guide_id)
-
-        existing_assignments = Assignment.objects.filter(trip=trip)
-        existing_ids = set(existing_assignments.values_list("guide_id", flat=True))
-        to_delete = existing_ids - set(guide_ids)
-        if to_delete:
-            Assignment.objects.filter(trip=trip, guide_id__in=to_delete).delete()
-
-        to_create = [gid for gid in guide_ids if gid not in existing_ids]
+    def _replace_assignments_by_ids(self, trip: Trip, guide_ids: Sequence[int]):
+        if not guide_ids:
+            Assignment.objects.filter(trip=trip).delete()
+            return
+
+        # The (trip, guide) unique constraint lets the database skip guides that are
+        # already assigned, so no read of the current assignments is needed.
+        Assignment.objects.filter(trip=trip).exclude(guide_id__in=guide_ids).delete()
         Assignment.objects.bulk_create(
-            [Assignment(trip=trip, guide_id=gid) for gid in to_create]
+            [Assignment(trip=trip, guide_id=gid) for gid in guide_ids],
+            batch_size=500,
+            ignore_conflicts=True,
         )
 
     @action(detail=True, methods=["post"], url_path="assign-guides")
     def assign_guides(self, request, pk=None):
         trip = self.get_object()
-        if not self._user_can_manage_trip(request.user, trip):
+        if not self._user_can_manage_trip(trip):
             return Response({"detail": "Not permitted."}, status=status.HTTP_403_FORBIDDEN)
 
         guide_ids = request.data.get("guide_ids")
@@ -294,20 +326,21 @@ class TripViewSet(viewsets.ModelViewSet):
         if len(set(guide_ids)) != len(guide_ids):
             return Response({"detail": "Duplicate guides are not allowed."}, status=status.HTTP_400_BAD_REQUEST)
 
-        guides = list(User.objects.filter(id__in=guide_ids))
+        active_membership = ServiceMembership.objects.filter(
+            user_id=OuterRef("pk"),
+            guide_service_id=trip.guide_service_id,
+            role=ServiceMembership.GUIDE,
+            is_active=True,
+        )
+        guides = list(
+            User.objects.filter(id__in=guide_ids)
+            .only("id", "display_name", "email")
+            .annotate(is_active_guide=Exists(active_membership))
+        )
         if len(guides) != len(guide_ids):
             return Response({"detail": "One or more guides not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        inactive = [
-            guide
-            for guide in guides
-            if not ServiceMembership.objects.filter(
-                user=guide,
-                guide_service=trip.guide_service,
-                role=ServiceMembership.GUIDE,
-                is_active=True,
-            ).exists()
-        ]
+        inactive = [guide for guide in guides if not guide.is_active_guide]
         if inactive:
             names = ", ".join(guide.display_name or guide.email for guide in inactive)
             return Response(
@@ -315,8 +348,10 @@ class TripViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        self._replace_assignments(trip, guides)
-        trip.refresh_from_db()
+        self._replace_assignments_by_ids(trip, [guide.id for guide in guides])
+        # Only the assignments changed; keep the prefetched parties instead of reloading the trip.
+        getattr(trip, "_prefetched_objects_cache", {}).pop("assignments", None)
+        prefetch_related_objects([trip], TripSerializer.assignments_prefetch())
         serializer = TripSerializer(trip, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -326,7 +361,7 @@ class TripTemplateViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = TripTemplate.objects.select_related('service').order_by('title')
+        queryset = TripTemplate.objects.with_related()
         user = self.request.user
         service_id = self.request.query_params.get('service')
 
@@ -335,13 +370,7 @@ class TripTemplateViewSet(viewsets.ModelViewSet):
                 return queryset.filter(service_id=service_id)
             return queryset
 
-        memberships = ServiceMembership.objects.filter(user=user, is_active=True)
-        if not memberships.exists():
-            return queryset.none()
-
-        manageable_services = memberships.filter(
-            role__in=[ServiceMembership.OWNER, ServiceMembership.MANAGER]
-        ).values_list('guide_service_id', flat=True)
+        manageable_services = self._manageable_service_ids()
 
         if not manageable_services:
             return queryset.none()
@@ -351,17 +380,40 @@ class TripTemplateViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(service_id=service_id)
         return queryset
 
+    def _manageable_service_ids(self) -> set[int]:
+        return {
+            membership_service_id
+            for membership_service_id, role in _active_memberships(self.request)
+            if role in PRIVILEGED_ROLES
+        }
+
+    def list(self, request, *args, **kwargs):
+        timeout = settings.TRIP_TEMPLATE_CACHE_TIMEOUT
+        if not timeout or set(request.query_params) - {"service"}:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # The visible rows come from the database in Meta.ordering, so the response
+        # order matches the uncached path; only the serialized payloads are cached.
+        rows = list(queryset.values_list("pk", "service_id"))
+        expected = {}
+        for pk, sid in rows:
+            expected.setdefault(sid, set()).add(pk)
+
+        keys = {template_list_cache_key(sid): sid for sid in expected}
+        cached = {keys[key]: items for key, items in cache.get_many(list(keys)).items()}
+        missing = [sid for sid, pks in expected.items() if not pks <= cached.get(sid, {}).keys()]
+        if missing:
+            fresh = {sid: {} for sid in missing}
+            for item in self.get_serializer(queryset.filter(service_id__in=missing), many=True).data:
+                fresh[item["service"]][item["id"]] = dict(item)
+            cache.set_many({template_list_cache_key(sid): items for sid, items in fresh.items()}, timeout)
+            cached.update(fresh)
+
+        return Response([cached[sid][pk] for pk, sid in rows])
+
     def _ensure_can_manage(self, service_id: int):
-        user = self.request.user
-        if user.is_superuser:
-            return
-        allowed = ServiceMembership.objects.filter(
-            user=user,
-            guide_service_id=service_id,
-            role__in=[ServiceMembership.OWNER, ServiceMembership.MANAGER],
-            is_active=True,
-        ).exists()
-        if not allowed:
+        if not _can_manage_service(self.request, service_id):
             raise PermissionDenied("Not permitted to manage templates for this service.")
 
     def perform_create(self, serializer):
@@ -387,33 +439,28 @@ class TripTemplateViewSet(viewsets.ModelViewSet):
         self._ensure_can_manage(template.service_id)
 
         new_title = self._generate_copy_title(template)
-        duplicate = TripTemplate.objects.create(
-            service=template.service,
-            title=new_title,
-            duration_hours=template.duration_hours,
-            duration_days=template.duration_days,
-            location=template.location,
-            pricing_currency=template.pricing_currency,
-            is_deposit_required=template.is_deposit_required,
-            deposit_percent=template.deposit_percent,
-            pricing_tiers=template.pricing_tiers,
-            timing_mode=template.timing_mode,
-            target_clients_per_guide=template.target_clients_per_guide,
-            notes=template.notes,
-            is_active=False,
-            created_by=request.user,
-        )
+        # Clone the loaded row in place so newly added template fields are copied automatically.
+        duplicate = template
+        duplicate.pk = None
+        duplicate._state.adding = True
+        duplicate.title = new_title
+        duplicate.is_active = False
+        duplicate.created_by = request.user
+        duplicate.save()
         serializer = TripTemplateSerializer(duplicate, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def _generate_copy_title(self, template: TripTemplate) -> str:
         base = template.title
-        suffix = " (Copy)"
-        new_title = f"{base}{suffix}"
-        existing = TripTemplate.objects.filter(service=template.service, title=new_title)
+        taken = set(
+            TripTemplate.objects.filter(
+                service_id=template.service_id,
+                title__startswith=f"{base} (Copy",
+            ).values_list("title", flat=True)
+        )
+        new_title = f"{base} (Copy)"
         counter = 2
-        while existing.exists():
+        while new_title in taken:
             new_title = f"{base} (Copy {counter})"
-            existing = TripTemplate.objects.filter(service=template.service, title=new_title)
             counter += 1
         return new_title
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+
+
+def template_list_cache_key(service_id: int) -> str:
+    return f"trip-templates:v2:service:{service_id}"
+
+
+def invalidate_template_list(service_id: int) -> None:
+    cache.delete(template_list_cache_key(service_id))
@@ -7,7 +7,9 @@ def populate_pricing_snapshot(apps, schema_editor):
     Trip = apps.get_model("trips", "Trip")
     from trips.pricing import build_single_tier_snapshot
 
-    for trip in Trip.objects.all():
+    pending = []
+    trips = Trip.objects.only("pk", "pricing_snapshot", "price_cents").iterator(chunk_size=2000)
+    for trip in trips:
         snapshot = trip.pricing_snapshot if isinstance(trip.pricing_snapshot, dict) else {}
         tiers = snapshot.get("tiers") if isinstance(snapshot, dict) else None
         if tiers:
@@ -20,14 +22,19 @@ def populate_pricing_snapshot(apps, schema_editor):
         is_deposit_required = snapshot.get("is_deposit_required") or False
         deposit_percent = snapshot.get("deposit_percent") or "0"
 
-        Trip.objects.filter(pk=trip.pk).update(
-            pricing_snapshot=build_single_tier_snapshot(
-                price_cents,
-                currency=currency,
-                is_deposit_required=is_deposit_required,
-                deposit_percent=deposit_percent,
-            )
+        trip.pricing_snapshot = build_single_tier_snapshot(
+            price_cents,
+            currency=currency,
+            is_deposit_required=is_deposit_required,
+            deposit_percent=deposit_percent,
         )
+        pending.append(trip)
+        if len(pending) >= 1000:
+            Trip.objects.bulk_update(pending, ["pricing_snapshot"])
+            pending = []
+
+    if pending:
+        Trip.objects.bulk_update(pending, ["pricing_snapshot"])
 
 
 class Migration(migrations.Migration):
@@ -16,21 +16,22 @@ def derive_target_ratio(apps, schema_editor):
             return clients or None
         return max(1, math.ceil(clients / guides))
 
-    for template in TripTemplate.objects.all():
-        clients = getattr(template, "target_client_count", None)
-        guides = getattr(template, "target_guide_count", None)
-        ratio = compute_ratio(clients, guides)
-        if ratio is not None:
-            template.target_clients_per_guide = ratio
-            template.save(update_fields=["target_clients_per_guide"])
-
-    for trip in Trip.objects.all():
-        clients = getattr(trip, "target_client_count", None)
-        guides = getattr(trip, "target_guide_count", None)
-        ratio = compute_ratio(clients, guides)
-        if ratio is not None:
-            trip.target_clients_per_guide = ratio
-            trip.save(update_fields=["target_clients_per_guide"])
+    for model in (TripTemplate, Trip):
+        rows = model.objects.only("pk", "target_client_count", "target_guide_count").iterator(chunk_size=2000)
+        pending = []
+        for row in rows:
+            clients = getattr(row, "target_client_count", None)
+            guides = getattr(row, "target_guide_count", None)
+            ratio = compute_ratio(clients, guides)
+            if ratio is None:
+                continue
+            row.target_clients_per_guide = ratio
+            pending.append(row)
+            if len(pending) >= 1000:
+                model.objects.bulk_update(pending, ["target_clients_per_guide"])
+                pending = []
+        if pending:
+            model.objects.bulk_update(pending, ["target_clients_per_guide"])
 
 
 class Migration(migrations.Migration):
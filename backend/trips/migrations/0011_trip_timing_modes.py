@@ -10,7 +10,10 @@ def backfill_timing_modes(apps, schema_editor):
     Trip = apps.get_model("trips", "Trip")
     TripTemplate = apps.get_model("trips", "TripTemplate")
 
-    for trip in Trip.objects.all():
+    fields = ["timing_mode", "duration_hours", "duration_days"]
+
+    pending = []
+    for trip in Trip.objects.only("pk", "start", "end").iterator(chunk_size=2000):
         start = getattr(trip, "start", None)
         end = getattr(trip, "end", None)
         if not start or not end:
@@ -27,9 +30,15 @@ def backfill_timing_modes(apps, schema_editor):
             trip.timing_mode = "multi_day"
             trip.duration_days = total_days
             trip.duration_hours = None
-        trip.save(update_fields=["timing_mode", "duration_hours", "duration_days"])
+        pending.append(trip)
+        if len(pending) >= 1000:
+            Trip.objects.bulk_update(pending, fields)
+            pending = []
+    if pending:
+        Trip.objects.bulk_update(pending, fields)
 
-    for template in TripTemplate.objects.all():
+    pending = []
+    for template in TripTemplate.objects.only("pk", "duration_hours").iterator(chunk_size=2000):
         hours = template.duration_hours
         if hours is None:
             hours = 8  # assume a full-day template if unset
@@ -41,7 +50,12 @@ def backfill_timing_modes(apps, schema_editor):
             template.timing_mode = "multi_day"
             template.duration_days = max(1, math.ceil(hours / 24))
             template.duration_hours = None
-        template.save(update_fields=["timing_mode", "duration_hours", "duration_days"])
+        pending.append(template)
+        if len(pending) >= 1000:
+            TripTemplate.objects.bulk_update(pending, fields)
+            pending = []
+    if pending:
+        TripTemplate.objects.bulk_update(pending, fields)
 
 
 class Migration(migrations.Migration):
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_assignments(apps, schema_editor):
+    Assignment = apps.get_model("trips", "Assignment")
+    duplicates = (
+        Assignment.objects.values("trip_id", "guide_id")
+        .annotate(keep_id=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for row in duplicates:
+        Assignment.objects.filter(trip_id=row["trip_id"], guide_id=row["guide_id"]).exclude(
+            pk=row["keep_id"]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("trips", "0011_trip_timing_modes"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_assignments, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="assignment",
+            unique_together={("trip", "guide")},
+        ),
+    ]
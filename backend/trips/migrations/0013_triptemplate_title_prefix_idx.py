@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0012_assignment_unique_trip_guide'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='triptemplate',
+            index=models.Index(
+                fields=['service', 'title'],
+                name='triptemplate_title_prefix_idx',
+                opclasses=['int8_ops', 'varchar_pattern_ops'],
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+def populate_price_cents(apps, schema_editor):
+    Trip = apps.get_model("trips", "Trip")
+    from trips.pricing import snapshot_base_price_cents
+
+    pending = []
+    trips = Trip.objects.only("pk", "pricing_snapshot").iterator(chunk_size=2000)
+    for trip in trips:
+        price_cents = snapshot_base_price_cents(trip.pricing_snapshot) or 0
+        if not price_cents:
+            continue
+        trip.price_cents = price_cents
+        pending.append(trip)
+        if len(pending) >= 1000:
+            Trip.objects.bulk_update(pending, ["price_cents"])
+            pending = []
+
+    if pending:
+        Trip.objects.bulk_update(pending, ["price_cents"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trips", "0014_trip_and_assignment_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="trip",
+            name="price_cents",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(populate_price_cents, migrations.RunPython.noop),
+    ]
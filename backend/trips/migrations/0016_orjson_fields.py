@@ -0,0 +1,27 @@
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0015_trip_price_cents'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='trip',
+            name='pricing_snapshot',
+            field=core.fields.ORJSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='template_snapshot',
+            field=core.fields.ORJSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='triptemplate',
+            name='pricing_tiers',
+            field=core.fields.ORJSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trips", "0016_orjson_fields"),
+    ]
+
+    operations = [
+        # Add the named constraint before dropping unique_together so uniqueness is never lifted.
+        migrations.AddConstraint(
+            model_name="assignment",
+            constraint=models.UniqueConstraint(fields=("trip", "guide"), name="uniq_assignment_trip_guide"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="assignment",
+            unique_together=set(),
+        ),
+    ]
@@ -3,8 +3,59 @@ from datetime import timedelta
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 
-from .pricing import build_single_tier_snapshot, snapshot_base_price_cents
+from core.fields import ORJSONField
+
+from .pricing import (
+    PricingLookup,
+    build_pricing_lookup,
+    build_single_tier_snapshot,
+    lookup_price_per_guest_cents,
+    ordered_tiers,
+    price_to_cents,
+)
+
+
+class TripQuerySet(models.QuerySet):
+    def with_related(self):
+        return self.select_related("guide_service")
+
+    def export_iter(self, chunk_size=2000):
+        """Stream trips for exports; keep prefetches off so iterator() stays chunked."""
+        return self.with_related().iterator(chunk_size=chunk_size)
+
+
+class AssignmentQuerySet(models.QuerySet):
+    def with_guide_name(self):
+        """Annotate guide_name: display name, else "first last", else email, resolved in SQL."""
+        full_name = Trim(Concat("guide__first_name", Value(" "), "guide__last_name"))
+        return self.annotate(
+            guide_name=Coalesce(
+                NullIf("guide__display_name", Value("")),
+                NullIf(full_name, Value("")),
+                "guide__email",
+                output_field=models.CharField(),
+            )
+        )
+
+    def with_related(self):
+        # Only the columns __str__ reads; the FK ids stay loaded so prefetches can still join.
+        return self.select_related("trip", "guide").only(
+            "id",
+            "trip_id",
+            "guide_id",
+            "trip__title",
+            "guide__first_name",
+            "guide__last_name",
+            "guide__email",
+        )
+
+
+class TripTemplateQuerySet(models.QuerySet):
+    def with_related(self):
+        return self.select_related("service")
 
 
 class Trip(models.Model):
@@ -31,7 +82,9 @@ class Trip(models.Model):
         default=MULTI_DAY,
     )
     notes = models.TextField(blank=True)
-    pricing_snapshot = models.JSONField(blank=True, null=True)
+    pricing_snapshot = ORJSONField(blank=True, null=True)
+    # Base per-guest price from pricing_snapshot, stored so trips can be sorted and filtered by price in SQL.
+    price_cents = models.PositiveIntegerField(default=0, db_index=True, editable=False)
     template_used = models.ForeignKey(
         'trips.TripTemplate',
         on_delete=models.SET_NULL,
@@ -39,15 +92,68 @@ class Trip(models.Model):
         blank=True,
         related_name='trips',
     )
-    template_snapshot = models.JSONField(blank=True, null=True)
+    template_snapshot = ORJSONField(blank=True, null=True)
+
+    # Columns copied onto the guide availability blocks of this trip's assignments.
+    SCHEDULE_FIELDS = ("guide_service_id", "start", "end", "title")
+
+    objects = TripQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['guide_service', 'start'], name='trip_service_start_idx'),
+            models.Index(fields=['start'], name='trip_start_idx'),
+            models.Index(fields=['end'], name='trip_end_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} @ {self.location}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_schedule()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self._remember_schedule()
+            return
+        # Partial refreshes (including deferred-field loads from full_clean()) only
+        # re-baseline the schedule fields they reloaded; other fields may hold unsaved edits.
+        loaded = self.__dict__.get("_loaded_schedule")
+        refreshed = {"guide_service_id" if name == "guide_service" else name for name in fields}
+        if loaded is not None and not refreshed.isdisjoint(self.SCHEDULE_FIELDS):
+            self.__dict__["_loaded_schedule"] = tuple(
+                getattr(self, name) if name in refreshed else value
+                for name, value in zip(self.SCHEDULE_FIELDS, loaded)
+            )
+
+    def _schedule_values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.SCHEDULE_FIELDS)
+
+    def _remember_schedule(self):
+        if not self.get_deferred_fields().intersection(self.SCHEDULE_FIELDS):
+            self.__dict__["_loaded_schedule"] = self._schedule_values()
+
+    def schedule_changed(self) -> bool:
+        """Whether SCHEDULE_FIELDS differ from the last load or save; True when unknown."""
+        loaded = self.__dict__.get("_loaded_schedule")
+        return loaded is None or loaded != self._schedule_values()
+
     @property
-    def price_cents(self) -> int:
-        base = snapshot_base_price_cents(self.pricing_snapshot)
-        return base or 0
+    def pricing_lookup(self) -> PricingLookup | None:
+        return self._pricing()[1]
+
+    def _pricing(self) -> tuple:
+        """Parsed tiers and base price for the snapshot, rebuilt only when the snapshot is replaced."""
+        cached = self.__dict__.get("_pricing_cache")
+        if cached is None or cached[0] is not self.pricing_snapshot:
+            lookup = build_pricing_lookup(self.pricing_snapshot)
+            cached = (self.pricing_snapshot, lookup, lookup_price_per_guest_cents(lookup, 1) or 0)
+            self.__dict__["_pricing_cache"] = cached
+        return cached
 
     def apply_single_day_duration(self):
         if self.duration_hours is None:
@@ -75,6 +181,7 @@ class Trip(models.Model):
             deposit_percent=current.get("deposit_percent") or "0",
         )
         self.pricing_snapshot = snapshot
+        self.sync_price_cents()
 
     def clean(self):
         super().clean()
@@ -89,9 +196,28 @@ class Trip(models.Model):
             if self.duration_days is None:
                 raise ValidationError({"duration_days": "Duration in days is required for multi-day trips."})
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        return super().save(*args, **kwargs)
+    def sync_price_cents(self):
+        self.price_cents = self._pricing()[2]
+
+    def save(self, *args, skip_validation=False, **kwargs):
+        self.sync_price_cents()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "pricing_snapshot" in update_fields and "price_cents" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "price_cents"]
+        if not skip_validation:
+            self.full_clean()
+        result = super().save(*args, **kwargs)
+        self._remember_schedule()
+        return result
+
+    @classmethod
+    def bulk_create_validated(cls, trips, *, batch_size=500):
+        """Run the query-free clean() checks on each trip, then insert them in batches."""
+        trips = list(trips)
+        for trip in trips:
+            trip.clean()
+            trip.sync_price_cents()
+        return cls.objects.bulk_create(trips, batch_size=batch_size)
 
 class Assignment(models.Model):
     trip = models.ForeignKey(
@@ -99,9 +225,31 @@ class Assignment(models.Model):
     )
     guide = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    objects = AssignmentQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["trip", "guide"], name="uniq_assignment_trip_guide"),
+        ]
+        indexes = [
+            # The unique constraint covers trip-first lookups; this serves guide-scoped trip lists.
+            models.Index(fields=["guide", "trip"], name="assignment_guide_trip_idx"),
+        ]
+
     def __str__(self):
         return f"{self.trip.title} → {self.guide.get_full_name() or self.guide.email}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the post_save signal spot a reassignment without re-reading the row.
+        instance._loaded_pair = (instance.trip_id, instance.guide_id)
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_pair = (self.trip_id, self.guide_id)
+
 
 class TripTemplate(models.Model):
     SINGLE_DAY = Trip.SINGLE_DAY
@@ -137,31 +285,35 @@ class TripTemplate(models.Model):
     pricing_currency = models.CharField(max_length=10, default='usd')
     is_deposit_required = models.BooleanField(default=False)
     deposit_percent = models.DecimalField(max_digits=5, decimal_places=2, default=0)
-    pricing_tiers = models.JSONField(default=list)
+    pricing_tiers = ORJSONField(default=list)
+
+    objects = TripTemplateQuerySet.as_manager()
 
     class Meta:
         ordering = ('title', 'id')
         unique_together = ('service', 'title')
+        indexes = [
+            # Pattern ops let Postgres serve the copy-title prefix scan from an index.
+            models.Index(
+                fields=['service', 'title'],
+                name='triptemplate_title_prefix_idx',
+                opclasses=['int8_ops', 'varchar_pattern_ops'],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.service.name})"
 
     def to_snapshot(self):
         tiers = []
-        for tier in sorted(self.pricing_tiers, key=lambda t: t.get("min_guests", 0)):
+        for tier in ordered_tiers(self.pricing_tiers):
             price = tier.get("price_per_guest")
-            price_cents = None
-            if price is not None:
-                try:
-                    price_cents = int(round(float(price) * 100))
-                except (TypeError, ValueError):
-                    price_cents = None
             tiers.append(
                 {
                     "min_guests": tier.get("min_guests"),
                     "max_guests": tier.get("max_guests"),
                     "price_per_guest": str(price) if price is not None else None,
-                    "price_per_guest_cents": price_cents,
+                    "price_per_guest_cents": price_to_cents(price),
                 }
             )
         return {
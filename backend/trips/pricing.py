@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from bisect import bisect_right
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+def format_cents(price_cents: int) -> str:
+    """Render integer cents as a two-decimal dollar string without a float round-trip."""
+    dollars, cents = divmod(abs(price_cents), 100)
+    return f"{'-' if price_cents < 0 else ''}{dollars}.{cents:02d}"
 
 
 def build_single_tier_snapshot(
@@ -22,7 +29,7 @@ def build_single_tier_snapshot(
             {
                 "min_guests": 1,
                 "max_guests": None,
-                "price_per_guest": f"{price_cents / 100:.2f}",
+                "price_per_guest": format_cents(price_cents),
                 "price_per_guest_cents": price_cents,
             }
         ],
@@ -33,50 +40,96 @@ def snapshot_base_price_cents(snapshot: Optional[Dict[str, Any]]) -> Optional[in
     return select_price_per_guest_cents(snapshot, party_size=1)
 
 
-def select_price_per_guest_cents(
-    snapshot: Optional[Dict[str, Any]],
-    party_size: int,
-    *,
-    default: Optional[int] = None,
-) -> Optional[int]:
-    if not snapshot or not isinstance(snapshot, dict):
-        return default
-    tiers = snapshot.get("tiers")
-    if not isinstance(tiers, list) or not tiers:
-        return default
+class PricingLookup(NamedTuple):
+    """Tier bounds and prices from a snapshot, ordered by min_guests."""
 
-    # Ensure tiers are evaluated in ascending order of min_guests to match validation rules.
-    sorted_tiers = sorted(
-        [
-            tier for tier in tiers
-            if isinstance(tier, dict)
-        ],
-        key=lambda tier: (tier.get("min_guests") or 1)
-    )
+    min_guests: Tuple[int, ...]
+    max_guests: Tuple[Optional[int], ...]
+    prices_cents: Tuple[Optional[int], ...]
 
-    selected_tier = None
-    for tier in sorted_tiers:
-        min_guests = tier.get("min_guests") or 1
-        max_guests = tier.get("max_guests")
-        if party_size < min_guests:
-            continue
-        if max_guests is not None and party_size > max_guests:
-            continue
-        selected_tier = tier
-        break
-
-    if selected_tier is None:
-        # Fallback to the last tier (open-ended) if no explicit match was found.
-        selected_tier = sorted_tiers[-1]
 
-    cents = selected_tier.get("price_per_guest_cents")
-    if cents is not None:
-        return cents
-    price = selected_tier.get("price_per_guest")
+def price_to_cents(price: Any) -> Optional[int]:
+    """
+    Convert a tier's dollar price (as stored in template JSON) to integer cents.
+
+    Prices with at most two decimal places are converted with integer arithmetic;
+    anything else falls back to rounding the float value.
+    """
     if price is None:
-        return default
+        return None
+    if isinstance(price, int):
+        return price * 100
+    if isinstance(price, str):
+        text = price.strip()
+        negative = text.startswith("-")
+        whole, _, fraction = text.lstrip("+-").partition(".")
+        if len(fraction) <= 2 and (whole or fraction) and (whole + fraction).isdecimal():
+            cents = int(whole or 0) * 100 + int(fraction.ljust(2, "0"))
+            return -cents if negative else cents
     try:
         value = float(price)
     except (TypeError, ValueError):
-        return default
+        return None
     return int(round(value * 100))
+
+
+def _tier_price_cents(tier: Dict[str, Any]) -> Optional[int]:
+    cents = tier.get("price_per_guest_cents")
+    if cents is not None:
+        return cents
+    return price_to_cents(tier.get("price_per_guest"))
+
+
+def ordered_tiers(tiers: Any) -> List[Dict[str, Any]]:
+    """The dict tiers from a tier list, in min_guests order."""
+    if not isinstance(tiers, list):
+        return []
+    result = [tier for tier in tiers if isinstance(tier, dict)]
+    # Tiers are written in min_guests order; only rows predating that need sorting here.
+    if any(
+        (earlier.get("min_guests") or 1) > (later.get("min_guests") or 1)
+        for earlier, later in zip(result, result[1:])
+    ):
+        result.sort(key=lambda tier: tier.get("min_guests") or 1)
+    return result
+
+
+def build_pricing_lookup(snapshot: Optional[Dict[str, Any]]) -> Optional[PricingLookup]:
+    if not snapshot or not isinstance(snapshot, dict):
+        return None
+    sorted_tiers = ordered_tiers(snapshot.get("tiers"))
+    if not sorted_tiers:
+        return None
+    return PricingLookup(
+        min_guests=tuple(tier.get("min_guests") or 1 for tier in sorted_tiers),
+        max_guests=tuple(tier.get("max_guests") for tier in sorted_tiers),
+        prices_cents=tuple(_tier_price_cents(tier) for tier in sorted_tiers),
+    )
+
+
+def lookup_price_per_guest_cents(
+    lookup: Optional[PricingLookup],
+    party_size: int,
+    *,
+    default: Optional[int] = None,
+) -> Optional[int]:
+    if lookup is None:
+        return default
+
+    # Tiers are contiguous, so the last tier starting at or below party_size is the only candidate.
+    index = bisect_right(lookup.min_guests, party_size) - 1
+    if index < 0 or (lookup.max_guests[index] is not None and party_size > lookup.max_guests[index]):
+        # Fallback to the last tier (open-ended) if no explicit match was found.
+        index = len(lookup.prices_cents) - 1
+
+    cents = lookup.prices_cents[index]
+    return default if cents is None else cents
+
+
+def select_price_per_guest_cents(
+    snapshot: Optional[Dict[str, Any]],
+    party_size: int,
+    *,
+    default: Optional[int] = None,
+) -> Optional[int]:
+    return lookup_price_per_guest_cents(build_pricing_lookup(snapshot), party_size, default=default)
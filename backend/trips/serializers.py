@@ -1,12 +1,45 @@
 from datetime import timedelta
 
+from django.db.models import Prefetch
 from rest_framework import serializers
 
-from accounts.models import ServiceMembership, User
+from accounts.memberships import get_active_guide_ids
+from accounts.models import User
+from bookings.models import TripParty
 from bookings.serializers import TripPartyCreateSerializer, TripPartySerializer
 from .models import Trip, Assignment, TripTemplate
 from .pricing import build_single_tier_snapshot
 
+# Trip durations cluster in a narrow range, so the common deltas are built once.
+_HOUR_DELTAS = tuple(timedelta(hours=hours) for hours in range(49))
+_DAY_DELTAS = tuple(timedelta(days=days) for days in range(61))
+
+
+def _hours_delta(hours: int) -> timedelta:
+    return _HOUR_DELTAS[hours] if 0 <= hours < len(_HOUR_DELTAS) else timedelta(hours=hours)
+
+
+def _days_delta(days: int) -> timedelta:
+    return _DAY_DELTAS[days] if 0 <= days < len(_DAY_DELTAS) else timedelta(days=days)
+
+
+def _coerce_duration(value, *, field: str, subject: str) -> int:
+    """Validate a duration_hours/duration_days value and return it as a positive int."""
+    hours = field == "duration_hours"
+    if value in (None, "", 0):
+        mode = "single-day" if hours else "multi-day"
+        unit = "hours" if hours else "days"
+        raise serializers.ValidationError({field: f"Duration in {unit} is required for {mode} {subject}."})
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise serializers.ValidationError({field: "Duration must be a positive integer."})
+    if value <= 0:
+        raise serializers.ValidationError(
+            {field: "Duration must be greater than zero." if hours else "Duration must be at least one day."}
+        )
+    return value
+
 
 class TripSerializer(serializers.ModelSerializer):
     parties = TripPartySerializer(many=True, read_only=True)
@@ -52,27 +85,51 @@ class TripSerializer(serializers.ModelSerializer):
             "end": {"required": False},
         }
 
+    @staticmethod
+    def assignments_prefetch():
+        """Prefetch for the assignments relation, with guide names annotated."""
+        assignments = Assignment.objects.only("id", "trip_id", "guide_id").with_guide_name()
+        return Prefetch("assignments", queryset=assignments)
+
+    @classmethod
+    def prefetches(cls):
+        """Prefetches for every relation this serializer reads."""
+        parties = TripPartySerializer.prefetch_queryset(TripParty.objects.order_by("created_at"))
+        return (Prefetch("parties", queryset=parties), cls.assignments_prefetch())
+
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join guide_service for guide_service_name and apply prefetches(); template_id only needs the FK column."""
+        return queryset.select_related("guide_service").prefetch_related(*cls.prefetches())
+
+    @staticmethod
+    def _assignments(obj: Trip):
+        # Trips from prefetch_queryset() answer from the cache; others still resolve guide names in one query.
+        if "assignments" in getattr(obj, "_prefetched_objects_cache", {}):
+            return obj.assignments.all()
+        return obj.assignments.with_guide_name()
+
     def get_assignments(self, obj: Trip):
-        assignments = obj.assignments.select_related("guide")
+        assignments = self._assignments(obj)
         return [
             {
                 "id": assignment.id,
                 "guide_id": assignment.guide_id,
-                "guide_name": assignment.guide.display_name
-                or f"{assignment.guide.first_name} {assignment.guide.last_name}".strip()
-                or assignment.guide.email,
+                "guide_name": assignment.guide_name,
             }
             for assignment in assignments
         ]
 
     def get_requires_assignment(self, obj: Trip) -> bool:
+        if "assignments" in getattr(obj, "_prefetched_objects_cache", {}):
+            return not obj.assignments.all()
         return not obj.assignments.exists()
 
 
 class TripCreateSerializer(TripSerializer):
     party = TripPartyCreateSerializer(write_only=True)
     guides = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(), many=True, required=False, allow_empty=True
+        queryset=User.objects.only("id", "email", "display_name"), many=True, required=False, allow_empty=True
     )
     template = serializers.PrimaryKeyRelatedField(
         queryset=TripTemplate.objects.filter(is_active=True),
@@ -83,7 +140,8 @@ class TripCreateSerializer(TripSerializer):
 
     class Meta(TripSerializer.Meta):
         fields = TripSerializer.Meta.fields + ["party", "guides", "template"]
-        read_only_fields = TripSerializer.Meta.read_only_fields + ["pricing_snapshot", "template_snapshot"]
+        # pricing_snapshot and template_snapshot are already read-only on TripSerializer.
+        read_only_fields = TripSerializer.Meta.read_only_fields
 
     def create(self, validated_data):
         party_data = validated_data.pop("party")
@@ -92,8 +150,9 @@ class TripCreateSerializer(TripSerializer):
         price_cents = validated_data.pop("price_cents", None)
 
         if template is not None:
+            snapshot = template.to_snapshot()
             validated_data["template_used"] = template
-            validated_data["template_snapshot"] = template.to_snapshot()
+            validated_data["template_snapshot"] = snapshot
             if not validated_data.get("title"):
                 validated_data["title"] = template.title
             if not validated_data.get("location"):
@@ -102,9 +161,7 @@ class TripCreateSerializer(TripSerializer):
             validated_data.setdefault("target_clients_per_guide", template.target_clients_per_guide)
             if not validated_data.get("notes"):
                 validated_data["notes"] = template.notes
-            snapshot = template.to_snapshot()
-            pricing_snapshot = snapshot.get("pricing")
-            validated_data["pricing_snapshot"] = pricing_snapshot
+            validated_data["pricing_snapshot"] = snapshot.get("pricing")
         else:
             if price_cents is None:
                 raise serializers.ValidationError({"price_cents": "Price per guest is required."})
@@ -112,17 +169,14 @@ class TripCreateSerializer(TripSerializer):
 
         trip = super().create(validated_data)
         self.context["party_data"] = party_data
-        seen = set()
-        ordered_guides = []
-        for guide in guides:
-            if guide.id not in seen:
-                ordered_guides.append(guide)
-                seen.add(guide.id)
+        # Dicts keep first-insertion order, so this drops repeats without reordering guides.
+        ordered_guides = list({guide.id: guide for guide in guides}.values())
         self.context["guides"] = ordered_guides
         self.guides = ordered_guides
         return trip
 
     def validate(self, attrs):
+        attrs = super().validate(attrs)
         guides = attrs.get("guides") or []
         service = attrs.get("guide_service")
         template = attrs.get("template")
@@ -154,31 +208,15 @@ class TripCreateSerializer(TripSerializer):
             raise serializers.ValidationError({"start": "Start time is required."})
 
         if timing_mode == Trip.SINGLE_DAY:
-            duration_hours = attrs.get("duration_hours")
-            if duration_hours in (None, "", 0):
-                raise serializers.ValidationError({"duration_hours": "Duration in hours is required for single-day trips."})
-            try:
-                duration_hours = int(duration_hours)
-            except (TypeError, ValueError):
-                raise serializers.ValidationError({"duration_hours": "Duration must be a positive integer."})
-            if duration_hours <= 0:
-                raise serializers.ValidationError({"duration_hours": "Duration must be greater than zero."})
+            duration_hours = _coerce_duration(attrs.get("duration_hours"), field="duration_hours", subject="trips")
             attrs["duration_hours"] = duration_hours
             attrs["duration_days"] = None
-            attrs["end"] = start + timedelta(hours=duration_hours)
+            attrs["end"] = start + _hours_delta(duration_hours)
         else:
-            duration_days = attrs.get("duration_days")
-            if duration_days in (None, "", 0):
-                raise serializers.ValidationError({"duration_days": "Duration in days is required for multi-day trips."})
-            try:
-                duration_days = int(duration_days)
-            except (TypeError, ValueError):
-                raise serializers.ValidationError({"duration_days": "Duration must be a positive integer."})
-            if duration_days <= 0:
-                raise serializers.ValidationError({"duration_days": "Duration must be at least one day."})
+            duration_days = _coerce_duration(attrs.get("duration_days"), field="duration_days", subject="trips")
             attrs["duration_days"] = duration_days
             attrs["duration_hours"] = None
-            attrs["end"] = start + timedelta(days=duration_days)
+            attrs["end"] = start + _days_delta(duration_days)
 
         if not template:
             if not attrs.get("title"):
@@ -186,29 +224,25 @@ class TripCreateSerializer(TripSerializer):
             if not attrs.get("location"):
                 raise serializers.ValidationError({"location": "This field is required."})
 
-        seen_ids = set()
-        for guide in guides:
-            if guide.id in seen_ids:
-                raise serializers.ValidationError({"guides": "Duplicate guides are not allowed."})
-            seen_ids.add(guide.id)
-            if service:
-                is_active = ServiceMembership.objects.filter(
-                    user=guide,
-                    guide_service=service,
-                    role=ServiceMembership.GUIDE,
-                    is_active=True,
-                ).exists()
-                if not is_active:
+        guide_ids = [guide.id for guide in guides]
+        # Reject duplicates before spending a query on memberships.
+        if len(set(guide_ids)) != len(guide_ids):
+            raise serializers.ValidationError({"guides": "Duplicate guides are not allowed."})
+        if service and guides:
+            active_guide_ids = get_active_guide_ids(service.id, guide_ids, request=self.context.get("request"))
+            for guide in guides:
+                if guide.id not in active_guide_ids:
                     raise serializers.ValidationError(
                         {"guides": f"{guide.display_name or guide.email} is not active for this service."}
                     )
-        return super().validate(attrs)
+        return attrs
 
 
 class GuideSummarySerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "display_name", "first_name", "last_name", "email"]
+        read_only_fields = fields
 
 
 class TripUpdateSerializer(TripSerializer):
@@ -218,43 +252,32 @@ class TripUpdateSerializer(TripSerializer):
         read_only_fields = TripSerializer.Meta.read_only_fields
 
     def validate(self, attrs):
+        attrs = super().validate(attrs)
         instance: Trip = self.instance
         if instance is None:
-            return super().validate(attrs)
+            return attrs
 
         start = attrs.get("start", instance.start)
         timing_mode = attrs.get("timing_mode", instance.timing_mode)
 
         if timing_mode == Trip.SINGLE_DAY:
-            duration_hours = attrs.get("duration_hours", instance.duration_hours)
-            if duration_hours in (None, "", 0):
-                raise serializers.ValidationError({"duration_hours": "Duration in hours is required for single-day trips."})
-            try:
-                duration_hours = int(duration_hours)
-            except (TypeError, ValueError):
-                raise serializers.ValidationError({"duration_hours": "Duration must be a positive integer."})
-            if duration_hours <= 0:
-                raise serializers.ValidationError({"duration_hours": "Duration must be greater than zero."})
+            duration_hours = _coerce_duration(
+                attrs.get("duration_hours", instance.duration_hours), field="duration_hours", subject="trips"
+            )
             attrs["timing_mode"] = Trip.SINGLE_DAY
             attrs["duration_hours"] = duration_hours
             attrs["duration_days"] = None
-            attrs["end"] = start + timedelta(hours=duration_hours)
+            attrs["end"] = start + _hours_delta(duration_hours)
         else:
-            duration_days = attrs.get("duration_days", instance.duration_days)
-            if duration_days in (None, "", 0):
-                raise serializers.ValidationError({"duration_days": "Duration in days is required for multi-day trips."})
-            try:
-                duration_days = int(duration_days)
-            except (TypeError, ValueError):
-                raise serializers.ValidationError({"duration_days": "Duration must be a positive integer."})
-            if duration_days <= 0:
-                raise serializers.ValidationError({"duration_days": "Duration must be at least one day."})
+            duration_days = _coerce_duration(
+                attrs.get("duration_days", instance.duration_days), field="duration_days", subject="trips"
+            )
             attrs["timing_mode"] = Trip.MULTI_DAY
             attrs["duration_days"] = duration_days
             attrs["duration_hours"] = None
-            attrs["end"] = start + timedelta(days=duration_days)
+            attrs["end"] = start + _days_delta(duration_days)
 
-        return super().validate(attrs)
+        return attrs
 
     def update(self, instance, validated_data):
         price_cents = validated_data.pop("price_cents", None)
@@ -310,28 +333,14 @@ class TripTemplateSerializer(serializers.ModelSerializer):
             duration_hours = attrs.get("duration_hours")
             if duration_hours is None:
                 duration_hours = getattr(self.instance, "duration_hours", None)
-            if duration_hours in (None, "", 0):
-                raise serializers.ValidationError({"duration_hours": "Duration in hours is required for single-day templates."})
-            try:
-                duration_hours = int(duration_hours)
-            except (TypeError, ValueError):
-                raise serializers.ValidationError({"duration_hours": "Duration must be a positive integer."})
-            if duration_hours <= 0:
-                raise serializers.ValidationError({"duration_hours": "Duration must be greater than zero."})
+            duration_hours = _coerce_duration(duration_hours, field="duration_hours", subject="templates")
             attrs["duration_hours"] = duration_hours
             attrs["duration_days"] = None
         else:
             duration_days = attrs.get("duration_days")
             if duration_days is None:
                 duration_days = getattr(self.instance, "duration_days", None)
-            if duration_days in (None, "", 0):
-                raise serializers.ValidationError({"duration_days": "Duration in days is required for multi-day templates."})
-            try:
-                duration_days = int(duration_days)
-            except (TypeError, ValueError):
-                raise serializers.ValidationError({"duration_days": "Duration must be a positive integer."})
-            if duration_days <= 0:
-                raise serializers.ValidationError({"duration_days": "Duration must be at least one day."})
+            duration_days = _coerce_duration(duration_days, field="duration_days", subject="templates")
             attrs["duration_days"] = duration_days
             attrs["duration_hours"] = None
 
@@ -357,6 +366,9 @@ class TripTemplateSerializer(serializers.ModelSerializer):
 
         if sorted_tiers[-1].get("max_guests") is not None:
             raise serializers.ValidationError({"pricing_tiers": "Final tier must leave max_guests blank for open-ended ranges."})
+        if "pricing_tiers" in attrs:
+            # Store tiers in min_guests order so snapshots never need re-sorting when priced.
+            attrs["pricing_tiers"] = sorted_tiers
 
         deposit = attrs.get("deposit_percent")
         if deposit is not None:
@@ -1,8 +1,9 @@
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from django.db import DatabaseError
+from django.db import DatabaseError, transaction
 
-from .models import Assignment, Trip
+from .caching import invalidate_template_list
+from .models import Assignment, Trip, TripTemplate
 
 
 def _get_guide_availability_model():
@@ -13,19 +14,21 @@ def _get_guide_availability_model():
 def _create_or_update_assignment_block(assignment):
     GuideAvailability = _get_guide_availability_model()
     try:
-        GuideAvailability.objects.update_or_create(
-            guide=assignment.guide,
-            trip=assignment.trip,
-            source=GuideAvailability.SOURCE_ASSIGNMENT,
-            defaults={
-                'guide_service': assignment.trip.guide_service,
-                'start': assignment.trip.start,
-                'end': assignment.trip.end,
-                'is_available': False,
-                'visibility': GuideAvailability.VISIBILITY_DETAIL,
-                'note': f"Trip assignment: {assignment.trip.title}",
-            },
-        )
+        # Savepoint so a swallowed error does not abort an enclosing transaction.
+        with transaction.atomic():
+            GuideAvailability.objects.update_or_create(
+                guide=assignment.guide,
+                trip=assignment.trip,
+                source=GuideAvailability.SOURCE_ASSIGNMENT,
+                defaults={
+                    'guide_service': assignment.trip.guide_service,
+                    'start': assignment.trip.start,
+                    'end': assignment.trip.end,
+                    'is_available': False,
+                    'visibility': GuideAvailability.VISIBILITY_DETAIL,
+                    'note': f"Trip assignment: {assignment.trip.title}",
+                },
+            )
     except DatabaseError:
         # During migrations tables may not exist yet; swallow errors gracefully.
         pass
@@ -34,29 +37,34 @@ def _create_or_update_assignment_block(assignment):
 def _delete_assignment_block(guide_id, trip_id):
     GuideAvailability = _get_guide_availability_model()
     try:
-        GuideAvailability.objects.filter(
-            guide_id=guide_id,
-            trip_id=trip_id,
-            source=GuideAvailability.SOURCE_ASSIGNMENT,
-        ).delete()
+        with transaction.atomic():
+            GuideAvailability.objects.filter(
+                guide_id=guide_id,
+                trip_id=trip_id,
+                source=GuideAvailability.SOURCE_ASSIGNMENT,
+            ).delete()
     except DatabaseError:
         pass
 
 
 @receiver(pre_save, sender=Assignment)
 def handle_assignment_pre_save(sender, instance, **kwargs):
-    if not instance.pk:
-        return
-    try:
-        previous = Assignment.objects.get(pk=instance.pk)
-    except Assignment.DoesNotExist:
+    # Instances loaded from the database already carry their previous pair; only
+    # hand-built instances with a pk need it read back before the row changes.
+    if not instance.pk or getattr(instance, "_loaded_pair", None) is not None:
         return
-    if previous.trip_id != instance.trip_id or previous.guide_id != instance.guide_id:
-        _delete_assignment_block(previous.guide_id, previous.trip_id)
+    instance._loaded_pair = (
+        Assignment.objects.filter(pk=instance.pk).values_list("trip_id", "guide_id").first()
+    )
 
 
 @receiver(post_save, sender=Assignment)
 def handle_assignment_post_save(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, "_loaded_pair", None)
+    if previous is not None and previous != (instance.trip_id, instance.guide_id):
+        # Drop the old block (and the previous guide's shares with it) rather than handing it over.
+        previous_trip_id, previous_guide_id = previous
+        _delete_assignment_block(previous_guide_id, previous_trip_id)
     _create_or_update_assignment_block(instance)
 
 
@@ -66,7 +74,14 @@ def handle_assignment_post_delete(sender, instance, **kwargs):
 
 
 @receiver(post_save, sender=Trip)
-def handle_trip_post_save(sender, instance, **kwargs):
+def handle_trip_post_save(sender, instance, created, update_fields=None, **kwargs):
+    # New trips have no assignments yet, and edits that leave the schedule alone need no sweep.
+    if created:
+        return
+    if update_fields is not None and not set(update_fields).intersection({*Trip.SCHEDULE_FIELDS, "guide_service"}):
+        return
+    if not instance.schedule_changed():
+        return
     GuideAvailability = _get_guide_availability_model()
     try:
         GuideAvailability.objects.filter(
@@ -80,3 +95,11 @@ def handle_trip_post_save(sender, instance, **kwargs):
         )
     except DatabaseError:
         pass
+
+
+@receiver(post_save, sender=TripTemplate)
+@receiver(post_delete, sender=TripTemplate)
+def handle_trip_template_change(sender, instance: TripTemplate, **kwargs):
+    # Deferred so a concurrent list request cannot re-cache the pre-commit templates.
+    service_id = instance.service_id
+    transaction.on_commit(lambda: invalidate_template_list(service_id))
@@ -1,11 +1,12 @@
 import pytest
 from django.utils import timezone
 
-from availability.models import GuideAvailability
+from availability.models import GuideAvailability, GuideAvailabilityShare
 from accounts.models import User
 from orgs.models import GuideService
 from trips.models import Assignment, Trip
 from trips.pricing import build_single_tier_snapshot
+from trips.serializers import TripSerializer
 
 
 @pytest.fixture
@@ -65,8 +66,88 @@ def test_assignment_update_refreshes_block(db, guide, trip):
     assert availability.note.endswith(trip.title)
 
 
+def test_trip_save_without_schedule_change_skips_block_refresh(db, guide, trip):
+    Assignment.objects.create(trip=trip, guide=guide)
+    GuideAvailability.objects.filter(trip=trip).update(note="Edited by hand")
+
+    trip.refresh_from_db()
+    trip.description = "Bring crampons."
+    trip.save()
+
+    availability = GuideAvailability.objects.get(guide=guide, trip=trip, source=GuideAvailability.SOURCE_ASSIGNMENT)
+    assert availability.note == "Edited by hand"
+
+    trip.title = "Alpine Ascent II"
+    trip.save()
+
+    availability.refresh_from_db()
+    assert availability.note.endswith("Alpine Ascent II")
+
+
+def test_refresh_from_db_resets_schedule_baseline(db, trip):
+    Trip.objects.filter(pk=trip.pk).update(title="Renamed Ascent")
+
+    trip.refresh_from_db()
+    assert not trip.schedule_changed()
+
+    trip.title = "Alpine Ascent"
+    assert trip.schedule_changed()
+
+
+def test_trip_loaded_with_deferred_fields_still_refreshes_block(db, guide, trip):
+    Assignment.objects.create(trip=trip, guide=guide)
+
+    deferred = Trip.objects.defer("description").get(pk=trip.pk)
+    deferred.title = "New Route"
+    deferred.save()
+
+    availability = GuideAvailability.objects.get(guide=guide, trip=trip, source=GuideAvailability.SOURCE_ASSIGNMENT)
+    assert availability.note.endswith("New Route")
+
+
+def test_reassigning_guide_replaces_block_without_shares(db, guide, trip):
+    other_guide = User.objects.create_user(
+        username="other@example.com",
+        email="other@example.com",
+        password="examplepass",
+    )
+    Assignment.objects.create(trip=trip, guide=guide)
+    assignment = Assignment.objects.get(trip=trip, guide=guide)
+    old_block = GuideAvailability.objects.get(guide=guide, trip=trip)
+    GuideAvailabilityShare.objects.create(
+        availability=old_block,
+        guide_service=trip.guide_service,
+        visibility=GuideAvailability.VISIBILITY_PRIVATE,
+    )
+
+    assignment.guide = other_guide
+    assignment.save()
+
+    assert not GuideAvailability.objects.filter(guide=guide, trip=trip).exists()
+    new_block = GuideAvailability.objects.get(guide=other_guide, trip=trip, source=GuideAvailability.SOURCE_ASSIGNMENT)
+    assert new_block.id != old_block.id
+    assert new_block.is_available is False
+    assert not new_block.shares.exists()
+    assert not GuideAvailabilityShare.objects.filter(availability_id=old_block.id).exists()
+
+
 def test_assignment_delete_removes_block(db, guide, trip):
     assignment = Assignment.objects.create(trip=trip, guide=guide)
     assignment.delete()
 
     assert not GuideAvailability.objects.filter(guide=guide, trip=trip, source=GuideAvailability.SOURCE_ASSIGNMENT).exists()
+
+
+def test_serializer_reads_assignments_from_prefetch(db, django_assert_num_queries, guide, trip):
+    Assignment.objects.create(trip=trip, guide=guide)
+    prefetched = TripSerializer.prefetch_queryset(Trip.objects.all()).get(pk=trip.pk)
+
+    with django_assert_num_queries(0):
+        assignments = TripSerializer().get_assignments(prefetched)
+        requires_assignment = TripSerializer().get_requires_assignment(prefetched)
+        service_name = prefetched.guide_service.name
+
+    assert requires_assignment is False
+    assert service_name == "Summit Guides"
+
+    assert assignments == [{"id": assignments[0]["id"], "guide_id": guide.id, "guide_name": "Guide Person"}]
@@ -58,7 +58,7 @@ def guide_user(db, service):
 
 
 @pytest.mark.django_db
-def test_owner_creates_booking(monkeypatch, owner, trip):
+def test_owner_creates_booking(monkeypatch, django_capture_on_commit_callbacks, owner, trip):
     client = APIClient()
     client.force_authenticate(owner)
 
@@ -93,8 +93,13 @@ def test_owner_creates_booking(monkeypatch, owner, trip):
         ],
     }
 
-    response = client.post(f"/api/trips/{trip.id}/parties/", payload, format="json")
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = client.post(f"/api/trips/{trip.id}/parties/", payload, format="json")
     assert response.status_code == 201
+    # The confirmation waits for the booking to commit.
+    assert emails == []
+    assert len(callbacks) == 1
+    callbacks[0]()
 
     booking = TripParty.objects.get()
     assert booking.party_size == 2
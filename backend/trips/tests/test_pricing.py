@@ -0,0 +1,54 @@
+from trips.pricing import (
+    build_pricing_lookup,
+    build_single_tier_snapshot,
+    format_cents,
+    lookup_price_per_guest_cents,
+    price_to_cents,
+    select_price_per_guest_cents,
+)
+
+
+TIERED_SNAPSHOT = {
+    "currency": "usd",
+    "tiers": [
+        {"min_guests": 3, "max_guests": 4, "price_per_guest": "130.00", "price_per_guest_cents": 13000},
+        {"min_guests": 1, "max_guests": 2, "price_per_guest": "150.00", "price_per_guest_cents": 15000},
+        {"min_guests": 5, "max_guests": None, "price_per_guest": "110.00"},
+    ],
+}
+
+
+def test_select_price_per_guest_cents_picks_matching_tier():
+    assert select_price_per_guest_cents(TIERED_SNAPSHOT, 1) == 15000
+    assert select_price_per_guest_cents(TIERED_SNAPSHOT, 2) == 15000
+    assert select_price_per_guest_cents(TIERED_SNAPSHOT, 3) == 13000
+    assert select_price_per_guest_cents(TIERED_SNAPSHOT, 4) == 13000
+    assert select_price_per_guest_cents(TIERED_SNAPSHOT, 12) == 11000
+
+
+def test_lookup_falls_back_to_last_tier_and_default():
+    lookup = build_pricing_lookup(TIERED_SNAPSHOT)
+
+    assert lookup.min_guests == (1, 3, 5)
+    assert lookup_price_per_guest_cents(lookup, 0) == 11000
+    assert lookup_price_per_guest_cents(None, 2, default=900) == 900
+    assert select_price_per_guest_cents({"tiers": []}, 2, default=900) == 900
+
+
+def test_price_to_cents_handles_stored_price_formats():
+    assert price_to_cents("19.99") == 1999
+    assert price_to_cents("19.9") == 1990
+    assert price_to_cents("-1.50") == -150
+    assert price_to_cents(20) == 2000
+    assert price_to_cents(19.99) == 1999
+    assert price_to_cents("19.995") == 2000
+    assert price_to_cents("abc") is None
+    assert price_to_cents(None) is None
+
+
+def test_format_cents_is_exact():
+    assert format_cents(15000) == "150.00"
+    assert format_cents(5) == "0.05"
+    assert format_cents(-150) == "-1.50"
+    assert format_cents(2**53 + 1) == "90071992547409.93"
+    assert build_single_tier_snapshot(1999)["tiers"][0]["price_per_guest"] == "19.99"
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APIClient
 
@@ -117,3 +119,34 @@ def test_user_without_memberships_sees_no_trips(guide_service_a):
     response = client.get("/api/trips/")
     assert response.status_code == 200
     assert response.data == []
+
+
+@pytest.mark.django_db
+def test_trip_list_query_count_does_not_grow_with_trips(guide_service_a):
+    manager = User.objects.create_user(
+        username="manager@example.com",
+        email="manager@example.com",
+        password="password123",
+    )
+    guide = User.objects.create_user(
+        username="guide@example.com",
+        email="guide@example.com",
+        password="password123",
+    )
+    ServiceMembership.objects.create(user=manager, guide_service=guide_service_a, role=ServiceMembership.MANAGER)
+    client = APIClient()
+    client.force_authenticate(user=manager)
+
+    def list_query_count():
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/trips/")
+        assert response.status_code == 200
+        return len(queries)
+
+    Assignment.objects.create(trip=_create_trip(guide_service_a, "Trip 1"), guide=guide)
+    baseline = list_query_count()
+
+    for index in range(2, 6):
+        Assignment.objects.create(trip=_create_trip(guide_service_a, f"Trip {index}", index), guide=guide)
+
+    assert list_query_count() == baseline
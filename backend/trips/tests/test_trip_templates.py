@@ -1,6 +1,7 @@
 import types
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.test import APIClient
 
@@ -170,6 +171,69 @@ def test_duplicate_template(owner, service):
     assert data["pricing_tiers"][0]["price_per_guest"] == "150.00"
 
 
+@pytest.mark.django_db
+def test_cached_template_list_refreshes_after_duplicate(
+    settings, owner, service, django_capture_on_commit_callbacks
+):
+    settings.TRIP_TEMPLATE_CACHE_TIMEOUT = 300
+    cache.clear()
+    template = TripTemplate.objects.create(
+        service=service,
+        title="Glacier Skills",
+        location="Coleman Glacier",
+        duration_hours=8,
+        pricing_tiers=TIERS,
+        timing_mode=Trip.SINGLE_DAY,
+    )
+    client = auth_client(owner)
+
+    first = client.get("/api/trip-templates/")
+    assert [item["id"] for item in first.json()] == [template.id]
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        client.post(f"/api/trip-templates/{template.id}/duplicate/")
+    assert callbacks
+    second = client.get(f"/api/trip-templates/?service={service.id}")
+    assert [item["title"] for item in second.json()] == ["Glacier Skills", "Glacier Skills (Copy)"]
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        template.location = "Easton Glacier"
+        template.save()
+    stale = client.get(f"/api/trip-templates/?service={service.id}")
+    assert stale.json()[0]["location"] == "Coleman Glacier"
+
+    for callback in callbacks:
+        callback()
+    fresh = client.get(f"/api/trip-templates/?service={service.id}")
+    assert fresh.json()[0]["location"] == "Easton Glacier"
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_cached_template_list_matches_uncached_order(settings, owner, service):
+    other = GuideService.objects.create(name="Ridge Guides", slug="ridge-guides", contact_email="hi@ridge.test")
+    ServiceMembership.objects.create(user=owner, guide_service=other, role=ServiceMembership.MANAGER)
+    for target, title in ((service, "beta Traverse"), (other, "Alpine Intro"), (service, "alpha Ridge"), (other, "Crag Day")):
+        TripTemplate.objects.create(
+            service=target,
+            title=title,
+            duration_hours=8,
+            pricing_tiers=TIERS,
+            timing_mode=Trip.SINGLE_DAY,
+        )
+    client = auth_client(owner)
+
+    settings.TRIP_TEMPLATE_CACHE_TIMEOUT = 0
+    uncached = [item["id"] for item in client.get("/api/trip-templates/").json()]
+    settings.TRIP_TEMPLATE_CACHE_TIMEOUT = 300
+    cache.clear()
+    cold = [item["id"] for item in client.get("/api/trip-templates/").json()]
+    warm = [item["id"] for item in client.get("/api/trip-templates/").json()]
+
+    assert cold == warm == uncached
+    cache.clear()
+
+
 @pytest.fixture
 def template(owner, service):
     return TripTemplate.objects.create(
@@ -32,3 +32,55 @@ def test_trip_end_must_be_after_start(guide_service):
         )
 
     assert "End time must be after the start time." in str(exc.value)
+
+
+@pytest.mark.django_db
+def test_bulk_create_validated_checks_each_trip(guide_service):
+    start = timezone.now()
+
+    def build(title, end):
+        return Trip(
+            guide_service=guide_service,
+            title=title,
+            location="Misty Mountains",
+            start=start,
+            end=end,
+            timing_mode=Trip.MULTI_DAY,
+            duration_days=1,
+            pricing_snapshot=build_single_tier_snapshot(15000),
+        )
+
+    with pytest.raises(ValidationError):
+        Trip.bulk_create_validated([
+            build("Day One", start + timezone.timedelta(days=1)),
+            build("Backwards", start - timezone.timedelta(hours=1)),
+        ])
+    assert not Trip.objects.exists()
+
+    Trip.bulk_create_validated([
+        build("Day One", start + timezone.timedelta(days=1)),
+        build("Day Two", start + timezone.timedelta(days=1)),
+    ])
+    assert Trip.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_price_cents_column_tracks_pricing_snapshot(guide_service):
+    start = timezone.now()
+    trip = Trip.objects.create(
+        guide_service=guide_service,
+        title="Misty Mountain Hike",
+        location="Misty Mountains",
+        start=start,
+        end=start + timezone.timedelta(days=1),
+        timing_mode=Trip.MULTI_DAY,
+        duration_days=1,
+        pricing_snapshot=build_single_tier_snapshot(15000),
+    )
+    assert Trip.objects.filter(price_cents=15000).exists()
+
+    trip.update_single_tier_pricing(12500)
+    trip.save(update_fields=["pricing_snapshot"])
+
+    trip.refresh_from_db()
+    assert trip.price_cents == 12500